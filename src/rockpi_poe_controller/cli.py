@@ -1,14 +1,32 @@
 """Command-line interface for ROCK Pi PoE HAT controller."""
 
 import argparse
+import fcntl
 import logging
+import os
 import sys
+from typing import Optional
 
 from .config import Config
-from .controller import FanController
+from .exceptions import FanControllerError
 
 logger = logging.getLogger(__name__)
 
+# Held by a running `start` for its whole lifetime, so that `stop` (or a
+# second `start`) does not fight it for the fan pins
+LOCK_FILE = "/run/rockpi-poe-controller.lock"
+
+
+def _acquire_lock() -> Optional[int]:
+    """Take the controller lock; return its fd, or None if it is held."""
+    fd = os.open(LOCK_FILE, os.O_RDONLY | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    return fd
+
 
 def setup_logging(log_level: str = "INFO") -> None:
     logging.basicConfig(
@@ -26,7 +44,10 @@ def create_parser() -> argparse.ArgumentParser:
         epilog="""
 Examples:
   %(prog)s start                    # Start fan controller
-  %(prog)s stop                     # Stop fan controller
+  %(prog)s stop                     # Turn the fan off after start has exited
+
+`stop` does not stop a running controller; send that process SIGTERM
+(e.g. `docker stop`) instead, which also turns the fan off.
         """
     )
 
@@ -37,16 +58,30 @@ Examples:
     subparsers.add_parser("start", help="Start fan controller")
 
     # Stop command
-    subparsers.add_parser("stop", help="Stop fan controller")
+    subparsers.add_parser(
+        "stop", help="Turn the fan off once the controller has exited")
 
     return parser
 
 
 def start_controller() -> None:
     try:
-        config = Config()
+        # Imported lazily so that `stop` does not pay for metrics/sensors
+        from .controller import FanController
+
+        config = Config.from_env()
         setup_logging(config.log_level)
 
+        try:
+            lock_fd = _acquire_lock()
+        except OSError as e:
+            # Not fatal: the lock only guards against a concurrent `stop`
+            logger.warning("Failed to take controller lock %s: %s",
+                           LOCK_FILE, str(e))
+        else:
+            if lock_fd is None:
+                raise FanControllerError("Fan controller is already running")
+
         controller = FanController(config)
         logger.info("Starting fan controller")
         controller.start()
@@ -60,11 +95,34 @@ def start_controller() -> None:
 
 def stop_controller() -> None:
     try:
-        config = Config()
+        from .gpio import GPIOController
+
+        config = Config.from_env()
         setup_logging(config.log_level)
 
-        controller = FanController(config)
-        controller.stop()
+        # A running controller keeps its last fan state cached and would not
+        # turn the fan back on, so leave the pins to it
+        try:
+            lock_fd = _acquire_lock()
+        except OSError as e:
+            logger.warning("Failed to check controller lock %s: %s",
+                           LOCK_FILE, str(e))
+        else:
+            if lock_fd is None:
+                raise FanControllerError(
+                    "Fan controller is running; send it SIGTERM instead")
+
+        # Only the fan pins are needed to turn the fan off; building a full
+        # FanController would also set up metrics and sensors.
+        gpio = GPIOController(
+            enable_pin=config.fan_enable_pin,
+            pwm_pin=config.fan_pwm_pin
+        )
+        if not gpio.is_available():
+            raise FanControllerError("GPIO controller not available")
+
+        gpio.turn_off()
+        gpio.cleanup()
         logger.info("Fan controller stopped")
 
     except Exception as e:
@@ -1,45 +1,119 @@
 """Configuration management for ROCK Pi PoE HAT controller."""
 
-from pydantic import Field
-from pydantic_settings import BaseSettings
+import os
+from dataclasses import dataclass, fields
+from typing import Mapping, Optional
 
+ENV_PREFIX = "POE_"
 
-class Config(BaseSettings):
-    class Config:
-        env_prefix = "POE_"
-        env_nested_delimiter = "__"
-        case_sensitive = False
+SCHED_POLICIES = ("other", "batch", "fifo")
 
+# (field, minimum, maximum) for range-checked settings
+_BOUNDS = (
+    ("lv0", 0, 100),
+    ("lv1", 0, 100),
+    ("lv2", 0, 100),
+    ("lv3", 0, 100),
+    ("hysteresis", 0.0, 20.0),
+    ("update_interval", 1.0, 300.0),
+    ("update_interval_max", 1.0, 300.0),
+    ("metrics_port", 1024, 65535),
+)
+
+
+def _parse_bool(value: str) -> bool:
+    lowered = value.lower()
+    if lowered in ("1", "true", "yes", "on"):
+        return True
+    if lowered in ("0", "false", "no", "off"):
+        return False
+    raise ValueError(f"Not a boolean: {value!r}")
+
+
+# Parsers for field types that cannot be built by calling the type itself
+_PARSERS = {bool: _parse_bool, Optional[int]: int}
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
     # Temperature thresholds
-    lv0: int = Field(default=40, ge=0, le=100,
-                     description="Temperature for 25% fan speed")
-    lv1: int = Field(default=45, ge=0, le=100,
-                     description="Temperature for 50% fan speed")
-    lv2: int = Field(default=50, ge=0, le=100,
-                     description="Temperature for 75% fan speed")
-    lv3: int = Field(default=55, ge=0, le=100,
-                     description="Temperature for 100% fan speed")
+    lv0: int = 40  # Temperature for 25% fan speed
+    lv1: int = 45  # Temperature for 50% fan speed
+    lv2: int = 50  # Temperature for 75% fan speed
+    lv3: int = 55  # Temperature for 100% fan speed
+    hysteresis: float = 2.0  # Degrees below a threshold to step back down
 
     # GPIO pins configuration
-    fan_enable_pin: int = Field(
-        default=16, description="GPIO pin for fan enable/disable")
-    fan_pwm_pin: int = Field(
-        default=13, description="GPIO pin for fan PWM control")
+    fan_enable_pin: int = 16  # GPIO pin for fan enable/disable
+    fan_pwm_pin: int = 13  # GPIO pin for fan PWM control
 
     # Control parameters
-    update_interval: float = Field(
-        default=10.0, ge=1.0, le=300.0, description="Temperature check interval in seconds")
+    update_interval: float = 10.0  # Temperature check interval in seconds
+    update_interval_max: float = 30.0  # Upper bound while temperature is steady
+
+    # Scheduling
+    sched_policy: str = "other"  # Control loop policy: other, batch or fifo
+    pin_to_cpu: Optional[int] = None  # CPU to pin the control loop to
+
     # Metrics configuration
-    metrics_host: str = Field(
-        default="0.0.0.0", description="Host for Prometheus metrics")
-    metrics_port: int = Field(
-        default=8000, ge=1024, le=65535, description="Port for Prometheus metrics")
+    metrics_enabled: bool = True  # Expose Prometheus metrics
+    metrics_host: str = "0.0.0.0"  # Host for Prometheus metrics
+    metrics_port: int = 8000  # Port for Prometheus metrics
 
     # Node identification
-    node_name: str = Field(
-        default="localhost", description="Node name for metrics labels")
-    node_ip: str = Field(
-        default="127.0.0.1", description="Node IP for metrics labels")
+    node_name: str = "localhost"  # Node name for metrics labels
+    node_ip: str = "127.0.0.1"  # Node IP for metrics labels
 
     # Logging
-    log_level: str = Field(default="INFO", description="Logging level")
+    log_level: str = "INFO"  # Logging level
+
+    def __post_init__(self) -> None:
+        for name, low, high in _BOUNDS:
+            value = getattr(self, name)
+            if not low <= value <= high:
+                raise ValueError(
+                    f"{name} must be between {low} and {high}, got {value}")
+
+        # Matched case-insensitively, like the variable names
+        object.__setattr__(self, "sched_policy", self.sched_policy.lower())
+        if self.sched_policy not in SCHED_POLICIES:
+            raise ValueError(
+                f"sched_policy must be one of {', '.join(SCHED_POLICIES)}, "
+                f"got {self.sched_policy!r}")
+
+        if self.pin_to_cpu is not None and self.pin_to_cpu < 0:
+            raise ValueError(
+                f"pin_to_cpu must be non-negative, got {self.pin_to_cpu}")
+
+        if not self.lv0 <= self.lv1 <= self.lv2 <= self.lv3:
+            raise ValueError(
+                "Temperature thresholds must satisfy lv0 <= lv1 <= lv2 <= lv3")
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "Config":
+        """Load configuration from ``POE_*`` environment variables.
+
+        Variable names are matched case-insensitively; unset variables keep
+        their defaults.
+
+        Raises:
+            ValueError: If a variable cannot be parsed or is out of range
+        """
+        if environ is None:
+            environ = os.environ
+        env = {key.upper(): value for key, value in environ.items()}
+
+        values = {}
+        for field in fields(cls):
+            env_name = ENV_PREFIX + field.name.upper()
+            raw = env.get(env_name)
+            if raw is None:
+                continue
+            parse = _PARSERS.get(field.type, field.type)
+            try:
+                values[field.name] = parse(raw.strip())
+            except ValueError as e:
+                raise ValueError(
+                    f"Invalid value for {env_name}: {raw!r}") from e
+
+        return cls(**values)
@@ -1,24 +1,56 @@
 """Main fan controller for ROCK Pi PoE HAT."""
 
+import bisect
 import logging
+import os
+import select
 import signal
+import threading
 import time
+from typing import Optional
 
 from .config import Config
 from .exceptions import FanControllerError, SensorError, GPIOError
 from .gpio import GPIOController
-from .metrics import MetricsCollector
+from .metrics import MetricsCollector, NullMetrics
 from .sensors import create_default_sensor_suite
 
 logger = logging.getLogger(__name__)
 
+# (speed_percent, duty_cycle) per band; band N is selected once the
+# temperature reaches the N-th threshold (lv0..lv3). A duty cycle of 0.0
+# means full speed and 1.0 means the fan is off.
+_FAN_SPEEDS = (
+    (0.0, 1.0),
+    (25.0, 0.75),
+    (50.0, 0.5),
+    (75.0, 0.25),
+    (100.0, 0.0),
+)
+
+# Temperature changes (°C) smaller than this since the last applied reading
+# are treated as sensor noise and skip the fan speed update
+_TEMPERATURE_NOISE_FLOOR = 0.1
+
+# Shortest poll interval (seconds) used by the adaptive schedule
+_MIN_UPDATE_INTERVAL = 1.0
+
+# While the fan is off and consecutive readings differ by less than this
+# (°C), the poll interval grows by the backoff factor each tick, up to the
+# configured max
+_STABLE_TEMPERATURE_DELTA = 0.5
+_INTERVAL_BACKOFF = 1.5
+
 
 class FanController:
     """Main fan controller for ROCK Pi PoE HAT."""
 
     def __init__(self, config: Config):
         self.config = config
-        self.metrics = MetricsCollector(config)
+        if config.metrics_enabled:
+            self.metrics = MetricsCollector(config)
+        else:
+            self.metrics = NullMetrics()
         self.gpio = GPIOController(
             enable_pin=config.fan_enable_pin,
             pwm_pin=config.fan_pwm_pin
@@ -26,21 +58,86 @@ class FanController:
         self.sensors = create_default_sensor_suite(
             metrics_collector=self.metrics)
 
+        self._thresholds = (config.lv0, config.lv1, config.lv2, config.lv3)
+        self._release_thresholds = tuple(
+            threshold - config.hysteresis for threshold in self._thresholds)
+        # Poll interval per band: update_interval while the fan is off,
+        # halved for every band above that, but never below one second
+        self._band_intervals = tuple(
+            max(_MIN_UPDATE_INTERVAL, config.update_interval / (1 << band))
+            for band in range(len(_FAN_SPEEDS)))
+
         self._running = False
+        # True while start() is inside the control loop; stop() then only
+        # asks the loop to exit
+        self._in_loop = False
         self._start_time = None
-        self._current_speed = 0.0
+        # Index into _FAN_SPEEDS last applied to the fan; None until the
+        # first update so that the initial duty cycle is always written
+        self._current_band: Optional[int] = None
         self._current_enabled = False
-
-        # Setup signal handlers
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        # Handlers replaced by start(), restored by stop()
+        self._previous_handlers = {}
+        # Self-pipe the interpreter writes to when a signal arrives, and
+        # stop() when called from another thread, so the control loop wakes
+        # up without waiting out the rest of the interval
+        self._wakeup_read = None
+        self._wakeup_write = None
+        self._previous_wakeup_fd = -1
+        self._shutdown_signal = None
 
         logger.info("Fan controller initialized")
 
     def _signal_handler(self, signum, frame):
-        """Handle shutdown signals."""
-        logger.info("Received shutdown signal: %s", signum)
-        self.stop()
+        """Handle shutdown signals.
+
+        Runs on the main thread in the middle of whatever the control loop
+        is doing, so it takes no locks and does no I/O: it only tells the
+        loop to exit. The wakeup fd cuts the current wait short, and start()
+        tears everything down once the loop has returned.
+        """
+        self._shutdown_signal = signum
+        self._running = False
+
+    def _install_signal_handlers(self) -> None:
+        self._wakeup_read, self._wakeup_write = os.pipe()
+        os.set_blocking(self._wakeup_write, False)
+        self._previous_wakeup_fd = signal.set_wakeup_fd(
+            self._wakeup_write, warn_on_full_buffer=False)
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            self._previous_handlers[signum] = signal.signal(
+                signum, self._signal_handler)
+
+    def _restore_signal_handlers(self) -> None:
+        for signum, handler in self._previous_handlers.items():
+            # None means the previous handler was not installed from Python
+            signal.signal(signum, signal.SIG_DFL if handler is None else handler)
+        self._previous_handlers.clear()
+
+        if self._wakeup_read is None:
+            return
+        signal.set_wakeup_fd(self._previous_wakeup_fd)
+        self._previous_wakeup_fd = -1
+        os.close(self._wakeup_read)
+        os.close(self._wakeup_write)
+        self._wakeup_read = self._wakeup_write = None
+
+    def _wait(self, timeout: float) -> None:
+        """Sleep up to ``timeout`` seconds, or until a signal or stop() wakes it."""
+        if select.select([self._wakeup_read], [], [], timeout)[0]:
+            # Drain the signal numbers and stop() wakeups
+            os.read(self._wakeup_read, 512)
+
+    def _wake(self) -> None:
+        """Cut the control loop's current wait short."""
+        fd = self._wakeup_write
+        if fd is None:
+            return
+        try:
+            os.write(fd, b"\0")
+        except OSError:
+            # A full pipe already has a wakeup pending
+            pass
 
     def start(self) -> None:
         """Start the fan controller."""
@@ -56,31 +153,63 @@ class FanController:
             # Start metrics server
             self.metrics.start_server()
 
+            # Only the control loop thread gets the scheduling settings; the
+            # metrics server thread has already been started
+            self._apply_scheduling()
+
             # Start fan control loop
             self._running = True
-            self._start_time = time.time()
+            self._start_time = time.monotonic()
+
+            # Setup signal handlers; done here rather than in __init__ so
+            # that merely constructing a controller leaves them untouched,
+            # and after _running is set so an early signal is not lost
+            self._install_signal_handlers()
 
             logger.info("Fan controller started")
+            self._in_loop = True
             self._control_loop()
 
         except Exception as e:
             logger.error("Failed to start controller: %s", str(e))
-            self.stop()
             raise
 
+        finally:
+            # Only reached once the loop has returned, so nothing below can
+            # race with a tick that is still driving the fan
+            self._in_loop = False
+            self.stop()
+
     def stop(self) -> None:
-        """Stop the fan controller."""
-        if not self._running:
+        """Stop the fan controller.
+
+        Safe to call from any thread. While the control loop is running this
+        only asks it to exit, and start() tears down on the main thread once
+        the loop has returned.
+        """
+        self._running = False
+
+        if (self._in_loop or
+                threading.current_thread() is not threading.main_thread()):
+            self._wake()
             return
 
+        # Not started, or already stopped
+        if self._start_time is None:
+            self._restore_signal_handlers()
+            return
+        self._start_time = None
+
+        if self._shutdown_signal is not None:
+            logger.info("Received shutdown signal: %s", self._shutdown_signal)
+            self._shutdown_signal = None
         logger.info("Stopping fan controller")
-        self._running = False
 
         try:
             # Turn off fan
             self.gpio.turn_off()
             self._current_enabled = False
-            self._current_speed = 0.0
+            self._current_band = None
 
             # Update metrics
             self.metrics.update_fan_enabled(False)
@@ -89,6 +218,9 @@ class FanController:
             # Cleanup GPIO
             self.gpio.cleanup()
 
+            # Release sensor file descriptors
+            self.sensors.close()
+
             # Stop metrics server
             self.metrics.stop_server()
 
@@ -97,66 +229,146 @@ class FanController:
         except Exception as e:
             logger.error("Error during shutdown: %s", str(e))
 
+        finally:
+            # Restored last so that a second signal cannot kill the process
+            # before the fan has been turned off
+            self._restore_signal_handlers()
+
+    def _apply_scheduling(self) -> None:
+        """Apply the optional CPU affinity and scheduling policy."""
+        if self.config.pin_to_cpu is not None:
+            try:
+                os.sched_setaffinity(0, {self.config.pin_to_cpu})
+                logger.info("Control loop pinned to CPU %d",
+                            self.config.pin_to_cpu)
+            except (AttributeError, OSError) as e:
+                logger.warning("Failed to pin control loop to CPU %d: %s",
+                               self.config.pin_to_cpu, str(e))
+
+        if self.config.sched_policy == "other":
+            return
+
+        try:
+            if self.config.sched_policy == "batch":
+                # The loop mostly sleeps; SCHED_BATCH keeps its wakeups from
+                # preempting other tasks
+                policy, priority = os.SCHED_BATCH, 0
+            else:
+                policy, priority = os.SCHED_FIFO, 1
+            os.sched_setscheduler(0, policy, os.sched_param(priority))
+            logger.info("Control loop scheduling policy set to %s",
+                        self.config.sched_policy)
+        except (AttributeError, OSError) as e:
+            logger.warning("Failed to set %s scheduling policy: %s",
+                           self.config.sched_policy, str(e))
+
     def _control_loop(self) -> None:
         """Main control loop for fan management."""
         logger.info("Starting fan control loop")
 
+        # Bind hot-path lookups once; Config is immutable, so the intervals
+        # cannot change while the loop is running
+        read_temperature = self.sensors.read_temperature
+        calculate_fan_speed = self._calculate_fan_speed
+        apply_fan_control = self._apply_fan_control
+        metrics = self.metrics
+        wait = self._wait
+        monotonic = time.monotonic
+        band_intervals = self._band_intervals
+        max_interval = self.config.update_interval_max
+        # start() always sets the start time before entering the loop
+        start_time = self._start_time
+        last_temperature = None
+        previous_temperature = None
+        interval = None
+        interval_band = None
+
+        # Ticks are scheduled against deadlines so the time spent in each
+        # iteration does not add up to drift; this is the current tick's
+        deadline = monotonic()
+
         while self._running:
+            stable = False
             try:
                 # Read temperature
-                temperature = self.sensors.read_temperature()
-                if self._start_time:
-                    uptime = time.time() - self._start_time
-                    self.metrics.update_uptime(uptime)
+                temperature = read_temperature()
+                metrics.update_uptime(monotonic() - start_time)
+
+                stable = (previous_temperature is not None and
+                          abs(temperature - previous_temperature) < _STABLE_TEMPERATURE_DELTA)
+                previous_temperature = temperature
+
+                if (last_temperature is not None and
+                        abs(temperature - last_temperature) < _TEMPERATURE_NOISE_FLOOR):
+                    continue
 
                 # Determine fan speed based on temperature
-                speed_percent, duty_cycle = self._calculate_fan_speed(
+                band, speed_percent, duty_cycle = calculate_fan_speed(
                     temperature)
 
                 # Apply fan control
-                self._apply_fan_control(speed_percent, duty_cycle)
+                apply_fan_control(band, speed_percent, duty_cycle)
+                last_temperature = temperature
 
-                # Log status
-                logger.info(
+                # Log status; speed changes are logged at INFO when applied
+                logger.debug(
                     "Fan control status - temp: %.1f°C, speed: %.1f%%, duty: %.2f, enabled: %s",
                     temperature, speed_percent, duty_cycle, self._current_enabled
                 )
 
             except SensorError as e:
+                # The sensor suite has already recorded the read error
                 logger.error("Sensor error in control loop: %s", str(e))
-                self.metrics.record_temperature_error()
 
             except GPIOError as e:
                 logger.error("GPIO error in control loop: %s", str(e))
-                self.metrics.record_gpio_error("control_loop")
+                metrics.record_gpio_error("control_loop")
 
             except Exception as e:
                 logger.error("Unexpected error in control loop: %s", str(e))
             finally:
-                time.sleep(self.config.update_interval)
-
-    def _calculate_fan_speed(self, temperature: float) -> tuple[float, float]:
-        if temperature >= self.config.lv3:
-            speed_percent = 100.0
-            duty_cycle = 0.0  # Full speed
-        elif temperature >= self.config.lv2:
-            speed_percent = 75.0
-            duty_cycle = 0.25
-        elif temperature >= self.config.lv1:
-            speed_percent = 50.0
-            duty_cycle = 0.5
-        elif temperature >= self.config.lv0:
-            speed_percent = 25.0
-            duty_cycle = 0.75
-        else:
-            speed_percent = 0.0
-            duty_cycle = 1.0  # Fan off
-
-        return speed_percent, duty_cycle
+                # Poll more often the faster the fan has to run. Only back
+                # off while the fan is off and the temperature holds steady;
+                # once it runs, the band's interval is the ceiling
+                band = self._current_band or 0
+                base_interval = band_intervals[band]
+                if stable and band == 0 and interval_band == 0:
+                    next_interval = min(interval * _INTERVAL_BACKOFF,
+                                        max(max_interval, base_interval))
+                else:
+                    next_interval = base_interval
+                if next_interval != interval:
+                    interval = next_interval
+                    metrics.update_poll_interval(interval)
+                interval_band = band
+
+                deadline += interval
+                timeout = deadline - monotonic()
+                if timeout > 0:
+                    wait(timeout)
+                else:
+                    # Overran the deadline; re-anchor rather than catch up
+                    # with a burst of back-to-back ticks
+                    deadline = monotonic()
+
+    def _calculate_fan_speed(self, temperature: float) -> tuple[int, float, float]:
+        band = bisect.bisect_right(self._thresholds, temperature)
+        current_band = self._current_band
+        if current_band is not None and band < current_band:
+            # Only step down once the temperature has dropped below the
+            # threshold minus the hysteresis
+            band = min(current_band, bisect.bisect_right(
+                self._release_thresholds, temperature))
+        speed_percent, duty_cycle = _FAN_SPEEDS[band]
+        return band, speed_percent, duty_cycle
+
+    def _apply_fan_control(self, band: int, speed_percent: float,
+                           duty_cycle: float) -> None:
+        if band == self._current_band:
+            return
 
-    def _apply_fan_control(self, speed_percent: float, duty_cycle: float) -> None:
         # Determine if fan should be enabled
-        enabled = speed_percent > 0.0
+        enabled = band > 0
 
         # Update fan enable state if needed
         if enabled != self._current_enabled:
@@ -165,11 +377,11 @@ class FanController:
             else:
                 self.gpio.turn_off()
             self._current_enabled = enabled
-
-        self.metrics.update_fan_enabled(self._current_enabled)
-
-        # Update fan speed if changed
-        if abs(duty_cycle - self._current_speed) > 0.01:  # Small threshold to avoid noise
-            self.gpio.set_fan_speed(duty_cycle)
-            self._current_speed = duty_cycle
-            self.metrics.update_fan_speed(speed_percent)
+            self.metrics.update_fan_enabled(enabled)
+
+        # Update fan speed
+        self.gpio.set_fan_speed(duty_cycle)
+        self._current_band = band
+        self.metrics.update_fan_speed(speed_percent)
+        logger.info("Fan speed changed - speed: %.1f%%, duty: %.2f",
+                    speed_percent, duty_cycle)
@@ -1,12 +1,13 @@
 """GPIO control for ROCK Pi PoE HAT fan management."""
 
 import logging
-from typing import Optional
-
-import mraa
+from typing import TYPE_CHECKING, Optional
 
 from .exceptions import GPIOError, HardwareNotAvailableError
 
+if TYPE_CHECKING:
+    import mraa
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,8 +23,9 @@ class GPIOController:
         """
         self.enable_pin = enable_pin
         self.pwm_pin = pwm_pin
-        self._enable_gpio: Optional[mraa.Gpio] = None
-        self._pwm_gpio: Optional[mraa.Pwm] = None
+        self._enable_gpio: Optional["mraa.Gpio"] = None
+        self._pwm_gpio: Optional["mraa.Pwm"] = None
+        self._current_duty_cycle: Optional[float] = None
         self._is_initialized = False
 
     def initialize(self) -> None:
@@ -33,6 +35,9 @@ class GPIOController:
             HardwareNotAvailableError: If GPIO pins are not available
         """
         try:
+            # Imported here so the package can be loaded without libmraa
+            import mraa
+
             logger.info("Detected platform: %s", mraa.getPlatformName())
 
             # Initialize enable pin
@@ -54,7 +59,10 @@ class GPIOController:
                 f"GPIO initialization failed: {e}") from e
 
     def is_available(self) -> bool:
-        """Check if GPIO controller is available."""
+        """Check if GPIO controller is available, initializing it if needed.
+
+        Must be called before the fan is switched or its speed is set.
+        """
         if not self._is_initialized:
             try:
                 self.initialize()
@@ -63,8 +71,8 @@ class GPIOController:
         return True
 
     def set_fan_enable(self, enabled: bool) -> None:
-        if not self.is_available():
-            raise GPIOError("GPIO controller not available")
+        if not self._is_initialized:
+            raise GPIOError("GPIO controller not initialized")
 
         try:
             value = 1 if enabled else 0
@@ -75,15 +83,19 @@ class GPIOController:
             raise GPIOError(f"Failed to set fan enable: {e}") from e
 
     def set_fan_speed(self, duty_cycle: float) -> None:
-        if not self.is_available():
-            raise GPIOError("GPIO controller not available")
+        if not self._is_initialized:
+            raise GPIOError("GPIO controller not initialized")
 
         if not 0.0 <= duty_cycle <= 1.0:
             raise ValueError("Duty cycle must be between 0.0 and 1.0")
 
+        if duty_cycle == self._current_duty_cycle:
+            return
+
         try:
             # Direct PWM value (0.0 = full speed, 1.0 = off)
             self._pwm_gpio.write(duty_cycle)
+            self._current_duty_cycle = duty_cycle
 
             logger.debug(
                 "Fan speed changed: duty_cycle=%f, pin: %d",
@@ -122,4 +134,5 @@ class GPIOController:
         except Exception as e:
             logger.warning("Error during GPIO cleanup: %s", str(e))
         finally:
+            self._current_duty_cycle = None
             self._is_initialized = False
@@ -2,71 +2,97 @@
 
 import logging
 
-from prometheus_client import Gauge, start_http_server
-
 logger = logging.getLogger(__name__)
 
 
 class MetricsCollector:
     """Collector for Prometheus metrics."""
 
+    # Labels shared by every metric, in the order their values are passed
+    _COMMON_LABEL_NAMES = ("node_name", "node_ip")
+
     def __init__(self, config):
         """Initialize metrics collector"""
+        # Imported here so that NullMetrics users never load prometheus_client
+        from prometheus_client import Counter, Gauge
+
         self.config = config
         self._server = None
         self._server_thread = None
         self._running = False
-        self._common_labels = {
-            "node_name": config.node_name,
-            "node_ip": config.node_ip
-        }
+        # Values in the same order as _COMMON_LABEL_NAMES, for the
+        # positional labels() form
+        self._common_values = (config.node_name, config.node_ip)
 
         # Temperature metrics
         self.temperature_gauge = Gauge(
             "rockpi_poe_temperature_celsius",
             "Current temperature in Celsius",
-            ["sensor_type"] + list(self._common_labels.keys())
+            ["sensor_type", *self._COMMON_LABEL_NAMES]
         )
 
         # Fan metrics
         self.fan_speed_gauge = Gauge(
             "rockpi_poe_fan_speed_percent",
             "Current fan speed as percentage",
-            list(self._common_labels.keys())
+            self._COMMON_LABEL_NAMES
         )
 
         self.fan_enabled_gauge = Gauge(
             "rockpi_poe_fan_enabled",
             "Fan enabled status (1=enabled, 0=disabled)",
-            list(self._common_labels.keys())
+            self._COMMON_LABEL_NAMES
         )
 
         # Control metrics
-        self.fan_speed_changes_total = Gauge(
+        self.fan_speed_changes_total = Counter(
             "rockpi_poe_fan_speed_changes_total",
             "Total number of fan speed changes",
-            list(self._common_labels.keys())
+            self._COMMON_LABEL_NAMES
         )
 
         # System metrics
         self.controller_uptime_seconds = Gauge(
             "rockpi_poe_controller_uptime_seconds",
             "Controller uptime in seconds",
-            list(self._common_labels.keys())
+            self._COMMON_LABEL_NAMES
+        )
+
+        self.poll_interval_seconds = Gauge(
+            "rockpi_poe_poll_interval_seconds",
+            "Current temperature poll interval in seconds",
+            self._COMMON_LABEL_NAMES
         )
 
-        self.temperature_read_errors_total = Gauge(
+        self.temperature_read_errors_total = Counter(
             "rockpi_poe_temperature_read_errors_total",
             "Total number of temperature read errors",
-            ["sensor_type"] + list(self._common_labels.keys())
+            ["sensor_type", *self._COMMON_LABEL_NAMES]
         )
 
-        self.gpio_errors_total = Gauge(
+        self.gpio_errors_total = Counter(
             "rockpi_poe_gpio_errors_total",
             "Total number of GPIO errors",
-            ["operation"] + list(self._common_labels.keys())
+            ["operation", *self._COMMON_LABEL_NAMES]
         )
 
+        # Children for metrics labelled only by node are bound once
+        self._fan_speed = self.fan_speed_gauge.labels(*self._common_values)
+        self._fan_enabled = self.fan_enabled_gauge.labels(
+            *self._common_values)
+        self._fan_speed_changes = self.fan_speed_changes_total.labels(
+            *self._common_values)
+        self._uptime = self.controller_uptime_seconds.labels(
+            *self._common_values)
+        self._poll_interval = self.poll_interval_seconds.labels(
+            *self._common_values)
+
+        # Children for per-sensor and per-operation metrics, bound on first
+        # use since the set of live sensors is only known at runtime
+        self._temperature_children = {}
+        self._temperature_error_children = {}
+        self._gpio_error_children = {}
+
         logger.info(
             "Metrics collector initialized - host: %s, port: %d",
             self.config.metrics_host, self.config.metrics_port)
@@ -78,6 +104,8 @@ class MetricsCollector:
             return
 
         try:
+            from prometheus_client import start_http_server
+
             self._server, self._server_thread = start_http_server(
                 self.config.metrics_port, addr=self.config.metrics_host)
             self._running = True
@@ -101,36 +129,79 @@ class MetricsCollector:
             logger.error("Error stopping metrics server: %s", str(e))
             self._running = False
 
+    def _child(self, children: dict, metric, value: str):
+        """Return the cached child of ``metric`` for its first label ``value``."""
+        child = children.get(value)
+        if child is None:
+            child = metric.labels(value, *self._common_values)
+            children[value] = child
+        return child
+
     def update_temperature(self, temperature: float, sensor_type: str) -> None:
-        labels = {"sensor_type": sensor_type, **self._common_labels}
-        self.temperature_gauge.labels(**labels).set(temperature)
+        self._child(self._temperature_children, self.temperature_gauge,
+                    sensor_type).set(temperature)
 
         logger.debug("Temperature metrics updated - temp: %.1f°C, sensor: %s",
                      temperature, sensor_type)
 
     def update_fan_speed(self, speed_percent: float) -> None:
-        self.fan_speed_gauge.labels(**self._common_labels).set(speed_percent)
-        self.fan_speed_changes_total.labels(**self._common_labels).inc()
+        self._fan_speed.set(speed_percent)
+        self._fan_speed_changes.inc()
 
         logger.debug("Fan speed metrics updated: %.1f%%", speed_percent)
 
     def update_fan_enabled(self, enabled: bool) -> None:
         value = 1 if enabled else 0
-        self.fan_enabled_gauge.labels(**self._common_labels).set(value)
+        self._fan_enabled.set(value)
 
         logger.debug("Fan enabled metrics updated: %s", enabled)
 
     def update_uptime(self, uptime_seconds: float) -> None:
-        self.controller_uptime_seconds.labels(
-            **self._common_labels).set(uptime_seconds)
+        self._uptime.set(uptime_seconds)
+
+    def update_poll_interval(self, interval_seconds: float) -> None:
+        self._poll_interval.set(interval_seconds)
+
+        logger.debug("Poll interval metrics updated: %.2fs", interval_seconds)
 
     def record_temperature_error(self, sensor_type: str) -> None:
-        labels = {"sensor_type": sensor_type, **self._common_labels}
-        self.temperature_read_errors_total.labels(**labels).inc()
+        self._child(self._temperature_error_children,
+                    self.temperature_read_errors_total, sensor_type).inc()
         logger.warning(
             "Temperature read error recorded - sensor: %s", sensor_type)
 
     def record_gpio_error(self, operation: str) -> None:
-        labels = {"operation": operation, **self._common_labels}
-        self.gpio_errors_total.labels(**labels).inc()
+        self._child(self._gpio_error_children, self.gpio_errors_total,
+                    operation).inc()
         logger.warning("GPIO error recorded - operation: %s", operation)
+
+
+class NullMetrics:
+    """Metrics sink used when metrics are disabled; every update is a no-op."""
+
+    def start_server(self) -> None:
+        pass
+
+    def stop_server(self) -> None:
+        pass
+
+    def update_temperature(self, temperature: float, sensor_type: str) -> None:
+        pass
+
+    def update_fan_speed(self, speed_percent: float) -> None:
+        pass
+
+    def update_fan_enabled(self, enabled: bool) -> None:
+        pass
+
+    def update_uptime(self, uptime_seconds: float) -> None:
+        pass
+
+    def update_poll_interval(self, interval_seconds: float) -> None:
+        pass
+
+    def record_temperature_error(self, sensor_type: str) -> None:
+        pass
+
+    def record_gpio_error(self, operation: str) -> None:
+        pass
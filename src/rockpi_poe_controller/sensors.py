@@ -3,17 +3,25 @@
 import logging
 import os
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional, Union
 
 from .exceptions import SensorError
-from .metrics import MetricsCollector
+from .metrics import MetricsCollector, NullMetrics
 
 logger = logging.getLogger(__name__)
 
+# Consecutive failed reads before a sensor is skipped, and the number of
+# reads it is then skipped for. A single transient error never drops a
+# sensor from the maximum, and a dead one is re-probed every few ticks.
+SENSOR_FAILURE_THRESHOLD = 3
+SENSOR_RETRY_READS = 3
+
 
 class TemperatureSensor(ABC):
     """Abstract base class for temperature sensors."""
 
+    __slots__ = ()
+
     @abstractmethod
     def read_temperature(self) -> float:
         """Read temperature from sensor."""
@@ -29,90 +37,159 @@ class TemperatureSensor(ABC):
         """Get the type identifier of the sensor."""
         pass
 
+    def close(self) -> None:
+        """Release any resources held by the sensor."""
+        pass
+
 
 class ThermalZoneSensor(TemperatureSensor):
     """Thermal zone temperature sensor."""
 
+    __slots__ = ("zone_id", "name", "device_path", "_sensor_type", "_fd")
+
     def __init__(self, zone_id: int, name: str):
         self.zone_id = zone_id
         self.name = name
         self.device_path = f"/sys/class/thermal/thermal_zone{zone_id}/temp"
-        self._available = None
+        self._sensor_type = f"thermal_zone_{name}"
+        self._fd = None
 
     def is_available(self) -> bool:
-        if self._available is None:
-            self._available = os.path.exists(self.device_path)
-        return self._available
+        return os.path.exists(self.device_path)
 
     def sensor_type(self) -> str:
-        return f"thermal_zone_{self.name}"
+        return self._sensor_type
 
     def read_temperature(self) -> float:
-        if not self.is_available():
-            raise SensorError(f"Thermal zone {self.name} not available")
-
         try:
-            with open(self.device_path, "r") as f:
-                raw_temp = int(f.read().strip())
+            if self._fd is None:
+                self._fd = os.open(self.device_path, os.O_RDONLY)
+            # Sysfs attributes are regenerated on every read from offset 0
+            raw_temp = int(os.pread(self._fd, 32, 0))
 
             temperature = raw_temp / 1000.0
 
             logger.debug(
-                "Thermal zone temperature read",
-                zone_id=self.zone_id,
-                name=self.name,
-                raw_temp=raw_temp,
-                temperature=temperature
+                "Thermal zone temperature read - zone: %d, name: %s, raw: %d, temp: %.1f°C",
+                self.zone_id, self.name, raw_temp, temperature
             )
             return temperature
 
-        except (OSError, ValueError) as e:
+        except OSError as e:
+            # The zone may have gone away (e.g. a driver rebind) and left the
+            # fd stale; reopen the path on the next read
+            self.close()
             raise SensorError(
                 f"Failed to read thermal zone {self.name}: {e}") from e
 
+        except ValueError as e:
+            raise SensorError(
+                f"Failed to read thermal zone {self.name}: {e}") from e
+
+    def close(self) -> None:
+        if self._fd is None:
+            return
+        try:
+            os.close(self._fd)
+        except OSError as e:
+            logger.warning("Failed to close thermal zone %s: %s",
+                           self.name, str(e))
+        finally:
+            self._fd = None
+
 
 class CompositeTemperatureSensor(TemperatureSensor):
     """Composite temperature sensor that reads from multiple sources."""
 
-    def __init__(self, sensors: List[TemperatureSensor], metrics_collector: MetricsCollector):
-        self.sensors = sensors
+    __slots__ = ("sensors", "metrics_collector", "_plan", "_failures",
+                 "_skip", "_max_sensor_type")
+
+    def __init__(self, sensors: List[TemperatureSensor],
+                 metrics_collector: Union[MetricsCollector, NullMetrics]):
+        # Sysfs sensors do not come and go at runtime, so probe them only once
+        self.sensors = []
+        for sensor in sensors:
+            if sensor.is_available():
+                self.sensors.append(sensor)
+            else:
+                logger.warning("Sensor %s not available, skipping",
+                               sensor.sensor_type())
         self.metrics_collector = metrics_collector
+        # (sensor_type, bound read method) per live sensor, so reads skip
+        # the per-call method lookups
+        self._plan = [(sensor.sensor_type(), sensor.read_temperature)
+                      for sensor in self.sensors]
+        # Consecutive failed reads, and reads left to skip, per sensor
+        self._failures = [0] * len(self.sensors)
+        self._skip = [0] * len(self.sensors)
+        self._max_sensor_type = f"{self.sensor_type()}_max"
 
     def is_available(self) -> bool:
-        return any(sensor.is_available() for sensor in self.sensors)
+        return bool(self.sensors)
 
     def sensor_type(self) -> str:
         return "composite"
 
-    def read_temperature(self) -> float:
-        temperatures = []
+    def _read_sensor(self, index: int, debug: bool) -> Optional[float]:
+        sensor_type, read = self._plan[index]
+        try:
+            temp = read()
+        except SensorError as e:
+            self._failures[index] += 1
+            logger.warning("Sensor %s failed: %s", sensor_type, str(e))
+            self.metrics_collector.record_temperature_error(sensor_type)
+            if self._failures[index] >= SENSOR_FAILURE_THRESHOLD:
+                self._skip[index] = SENSOR_RETRY_READS
+            return None
+
+        # A sensor that recovers on a fallback read rejoins the maximum at once
+        self._failures[index] = 0
+        self._skip[index] = 0
+        if debug:
+            logger.debug("Sensor %s temperature: %.1f°C", sensor_type, temp)
+        self.metrics_collector.update_temperature(temp, sensor_type)
+        return temp
 
-        for sensor in self.sensors:
-            if sensor.is_available():
-                try:
-                    temp = sensor.read_temperature()
-                    temperatures.append(temp)
-                    logger.debug("Sensor %s temperature: %.1f°C",
-                                 sensor.sensor_type(), temp)
-                    self.metrics_collector.update_temperature(
-                        temp, sensor.sensor_type())
-                except SensorError as e:
-                    logger.warning("Sensor %s failed: %s",
-                                   sensor.sensor_type(), str(e))
-                    self.metrics_collector.record_temperature_error(sensor.sensor_type())
-
-        if not temperatures:
+    def read_temperature(self) -> float:
+        # Running maximum instead of collecting readings into a list
+        max_temp = None
+        deferred = []
+
+        debug = logger.isEnabledFor(logging.DEBUG)
+        skip = self._skip
+
+        for index in range(len(self.sensors)):
+            if skip[index]:
+                skip[index] -= 1
+                deferred.append(index)
+                continue
+            temp = self._read_sensor(index, debug)
+            if temp is not None and (max_temp is None or temp > max_temp):
+                max_temp = temp
+
+        # Retry failed sensors early rather than leave the fan without input
+        if max_temp is None:
+            for index in deferred:
+                temp = self._read_sensor(index, debug)
+                if temp is not None and (max_temp is None or temp > max_temp):
+                    max_temp = temp
+
+        if max_temp is None:
             self.metrics_collector.record_temperature_error(self.sensor_type())
             raise SensorError("No temperature sensors are available")
 
-        max_temp = max(temperatures)
         self.metrics_collector.update_temperature(
-            max_temp, f"{self.sensor_type()}_max")
+            max_temp, self._max_sensor_type)
 
         return max_temp
 
+    def close(self) -> None:
+        for sensor in self.sensors:
+            sensor.close()
+
 
-def create_default_sensor_suite(metrics_collector: MetricsCollector) -> CompositeTemperatureSensor:
+def create_default_sensor_suite(
+        metrics_collector: Union[MetricsCollector, NullMetrics]) -> CompositeTemperatureSensor:
     sensors = [
         ThermalZoneSensor(0, "cpu"),
         ThermalZoneSensor(1, "gpu"),